@@ -0,0 +1,111 @@
+"""
+Per-frame allocation / RSS comparison of the old frame path (new BGR frame,
+new RGB copy, drawing into the inference frame) against the pooled path.
+
+Uses synthetic frames so it runs without a webcam or the models:
+    python -m benchmarks.alloc_bench --frames 300 --width 1280 --height 720
+
+Each mode runs in its own process so max RSS is not shared between them.
+"""
+import argparse
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from utils import FrameBufferPool, apply_overlay, draw_alerts
+
+ALERTS = ["ALERT: Mobile phone detected"]
+
+
+def baseline_step():
+    def step(src):
+        frame = src.copy() # what cap.read() does without a destination
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        draw_alerts(frame, ALERTS)
+        return rgb
+    return step
+
+
+def pooled_step():
+    pool = FrameBufferPool()
+
+    def step(src):
+        frame = pool.like("frame", src)
+        np.copyto(frame, src) # cap.read(frame) decodes in place
+        rgb = pool.like("rgb", frame)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+        overlay = pool.like("overlay", frame)
+        overlay.fill(0)
+        draw_alerts(overlay, ALERTS)
+        apply_overlay(frame, overlay, pool.get("overlay_mask", frame.shape[:2]))
+        return rgb
+    return step
+
+
+MODES = {"baseline": baseline_step, "pooled": pooled_step}
+
+
+def measure(step, src, frames):
+    for _ in range(5): # warm up, lets the pool allocate
+        step(src)
+
+    tracemalloc.start()
+    churn = 0
+    start = time.perf_counter()
+
+    for _ in range(frames):
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        step(src)
+        churn += tracemalloc.get_traced_memory()[1] - base
+
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    return churn / frames, elapsed / frames
+
+
+def run(mode, args):
+    rng = np.random.default_rng(0)
+    src = rng.integers(0, 255, size=(args.height, args.width, 3), dtype=np.uint8)
+
+    per_frame, seconds = measure(MODES[mode](), src, args.frames)
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(
+        f"{mode:9s} alloc/frame: {per_frame / 1e6:6.2f} MB"
+        f" | alloc/s @{args.fps}fps: {per_frame * args.fps / 1e6:7.1f} MB"
+        f" | {seconds * 1000:5.2f} ms/frame"
+        f" | max RSS: {rss_mb:.0f} MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=["all", *MODES], default="all")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--fps", type=int, default=30)
+    args = parser.parse_args()
+
+    if args.mode != "all":
+        run(args.mode, args)
+        return
+
+    for mode in MODES:
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.alloc_bench", "--mode", mode,
+             "--frames", str(args.frames), "--width", str(args.width),
+             "--height", str(args.height), "--fps", str(args.fps)],
+            check=True
+        )
+
+
+if __name__ == "__main__":
+    main()
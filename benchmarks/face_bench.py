@@ -0,0 +1,196 @@
+"""
+Per-frame cost of the head pose path (BGR -> RGB, FaceMesh, landmark analysis,
+HeadPoseRules) on synthetic frames holding 1 / 2 / 4 tiled copies of a face, for
+each FaceMesh max_num_faces setting.
+
+FaceMesh runs in video mode (as live) and its results are kept. The analysis is then
+timed alone, in a loop over those results, both ways:
+    current : face_signals per face + HeadPoseRules.evaluate (face tracks, per-face blinks)
+    scalar  : the previous single-face code (pixel conversion, pose, gaze, EAR,
+              thresholds, blink counter) run once per face
+
+    python -m benchmarks.face_bench --image photo_with_one_face.jpg
+"""
+import argparse
+import math
+import statistics
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from core.face_geometry import face_signals
+from core.head_pose_rules import HeadPoseRules
+from detectors import HeadPoseDetector
+
+W, H = 640, 480
+FACE_SIZE = 200 # px, every tile holds the face at the same size
+
+# Tile centers per face count, the face size stays the same so only the count changes
+LAYOUTS = {
+    1: [(320, 240)],
+    2: [(160, 240), (480, 240)],
+    4: [(160, 120), (480, 120), (160, 360), (480, 360)],
+}
+
+
+def _face_crop(image):
+    """
+    Square crop around the face FaceMesh finds in image, resized to FACE_SIZE
+    """
+    with mp.solutions.face_mesh.FaceMesh(static_image_mode=True, refine_landmarks=True) as face_mesh:
+        results = face_mesh.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+    if not results.multi_face_landmarks:
+        raise SystemExit("No face found in --image")
+
+    h, w = image.shape[:2]
+    points = np.array([(lm.x * w, lm.y * h) for lm in results.multi_face_landmarks[0].landmark])
+    (x1, y1), (x2, y2) = points.min(axis=0), points.max(axis=0)
+    cx, cy, half = (x1 + x2) / 2, (y1 + y2) / 2, 0.75 * max(x2 - x1, y2 - y1)
+
+    x1, y1 = max(0, int(cx - half)), max(0, int(cy - half))
+    x2, y2 = min(w, int(cx + half)), min(h, int(cy + half))
+    return cv2.resize(image[y1:y2, x1:x2], (FACE_SIZE, FACE_SIZE))
+
+
+def make_frame(face, count):
+    frame = np.full((H, W, 3), 96, dtype=np.uint8)
+    half = FACE_SIZE // 2
+    for cx, cy in LAYOUTS[count]:
+        frame[cy - half:cy + half, cx - half:cx + half] = face
+    return frame
+
+
+class ScalarHeadPose:
+    """
+    Previous per-face analysis (HeadPoseDetector before batching), one blink counter per face slot
+    """
+    def __init__(self):
+        self.rules = HeadPoseRules()
+        self.blink_counters = []
+        self.total_blinks = 0
+
+    @staticmethod
+    def _dist(p1, p2):
+        return math.hypot(p1[0] - p2[0], p1[1] - p2[1])
+
+    def _eye_aspect_ratio(self, eye):
+        return (self._dist(eye[1], eye[5]) + self._dist(eye[2], eye[4])) / (2.0 * self._dist(eye[0], eye[3]) + 1e-6)
+
+    def _face(self, landmarks, w, h, slot):
+        r = self.rules
+
+        def px(i):
+            return int(landmarks[i].x * w), int(landmarks[i].y * h)
+
+        nose, left_cheek, right_cheek, forehead, chin = px(1), px(234), px(454), px(10), px(152)
+        face_width = max(1, right_cheek[0] - left_cheek[0])
+        face_height = max(1, chin[1] - forehead[1])
+        partial_face = face_width < r.MIN_FACE_WIDTH or face_height < r.MIN_FACE_HEIGHT
+
+        yaw = (nose[0] - (left_cheek[0] + right_cheek[0]) // 2) / face_width
+        pitch = (nose[1] - (forehead[1] + chin[1]) // 2) / face_height
+
+        le_left, le_right, le_iris = px(33), px(133), px(468)
+        re_left, re_right, re_iris = px(362), px(263), px(473)
+        left_gaze = (le_iris[0] - (le_left[0] + le_right[0]) // 2) / max(1, le_right[0] - le_left[0])
+        right_gaze = (re_iris[0] - (re_left[0] + re_right[0]) // 2) / max(1, re_right[0] - re_left[0])
+        gaze = (left_gaze + right_gaze) / 2
+
+        left_eye = [px(i) for i in [33, 160, 158, 133, 153, 144]]
+        right_eye = [px(i) for i in [362, 385, 387, 263, 373, 380]]
+        ear = (self._eye_aspect_ratio(left_eye) + self._eye_aspect_ratio(right_eye)) / 2.0
+
+        blinked = False
+        if ear < r.EAR_THRESHOLD:
+            self.blink_counters[slot] += 1
+        else:
+            if self.blink_counters[slot] >= r.BLINK_FRAMES:
+                self.total_blinks += 1
+                blinked = True
+            self.blink_counters[slot] = 0
+
+        return (
+            abs(yaw) > r.LOOK_AWAY_YAW, pitch > r.LOOK_DOWN_PITCH, pitch < r.LOOK_UP_PITCH,
+            gaze < r.GAZE_LEFT, gaze > r.GAZE_RIGHT, partial_face,
+            yaw, pitch, gaze, ear, blinked, self.total_blinks
+        )
+
+    def evaluate(self, multi_face_landmarks, w, h):
+        faces = multi_face_landmarks or []
+        self.blink_counters = (self.blink_counters + [0] * len(faces))[:len(faces)]
+        return [self._face(face.landmark, w, h, slot) for slot, face in enumerate(faces)]
+
+
+def measure(max_num_faces, frame, frames, repeat):
+    """
+    Median per frame: (faces found, FaceMesh incl. BGR -> RGB in ms, current analysis in us, scalar analysis in us)
+    """
+    detector = HeadPoseDetector(max_num_faces=max_num_faces)
+    h, w = frame.shape[:2]
+    rgb = detector.pool.like("rgb", frame)
+
+    mesh_ms, recorded = [], []
+    for i in range(frames + 20): # the first frames run face detection, let tracking settle
+        start = time.perf_counter()
+        rgb.flags.writeable = True
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+        rgb.flags.writeable = False
+        results = detector.face_mesh.process(rgb)
+        elapsed = time.perf_counter() - start
+
+        if i >= 20:
+            mesh_ms.append(elapsed * 1000)
+            recorded.append(results.multi_face_landmarks)
+
+    def current(rules, faces):
+        rules.evaluate([face_signals(face.landmark, w, h) for face in faces] if faces else None)
+
+    def scalar(analysis, faces):
+        analysis.evaluate(faces, w, h)
+
+    # Analysis alone, fresh state per pass, order alternated between passes
+    analysis_us = {current: [], scalar: []}
+    for i in range(repeat):
+        passes = [(current, HeadPoseRules()), (scalar, ScalarHeadPose())]
+        for run, state in (passes if i % 2 else passes[::-1]):
+            for faces in recorded:
+                start = time.perf_counter()
+                run(state, faces)
+                analysis_us[run].append((time.perf_counter() - start) * 1e6)
+
+    found = len(recorded[-1] or [])
+    return found, statistics.median(mesh_ms), statistics.median(analysis_us[current]), statistics.median(analysis_us[scalar])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--image", required=True, help="photo with one frontal face, tiled into the test frames")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20, help="analysis passes over the recorded FaceMesh results")
+    parser.add_argument("--max-faces", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--faces", type=int, nargs="+", default=[1, 2, 4], choices=list(LAYOUTS))
+    args = parser.parse_args()
+
+    image = cv2.imread(args.image)
+    if image is None:
+        raise SystemExit(f"Could not read {args.image}")
+    face = _face_crop(image)
+
+    for max_num_faces in args.max_faces:
+        base = None
+        for count in args.faces:
+            found, mesh, current, scalar = measure(max_num_faces, make_frame(face, count), args.frames, args.repeat)
+            total = mesh + current / 1000
+            base = base or total
+            print(
+                f"max_num_faces={max_num_faces} | {count} face(s) in frame, {found} found"
+                f" | FaceMesh {mesh:6.2f} ms"
+                f" | analysis current {current:5.1f} us, scalar {scalar:5.1f} us"
+                f" | end to end {total:6.2f} ms ({total / base:4.2f}x of 1 face)"
+            )
+
+
+if __name__ == "__main__":
+    main()
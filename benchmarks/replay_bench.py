@@ -0,0 +1,194 @@
+"""
+Offline replay check + speed on a synthetic session (no video or models needed).
+
+The session is run twice through the real post-processing / tracking / alert logic:
+    live   : detector outputs fed straight in, as main.py does
+    replay : the same outputs written with DetectionCacheWriter, read back from the
+             .npz and replayed with sweep.replay, as sweep.py does
+Both must raise the same alerts on the same frames. Then replay speed is timed.
+
+    python -m benchmarks.replay_bench --frames 3000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import numpy as np
+
+import config
+from core import HeadPoseRules, ProctorSession
+from core.face_geometry import (
+    CHIN, FOREHEAD, LEFT_CHEEK, LEFT_EYE_LEFT, LEFT_EYE_POINTS, LEFT_EYE_RIGHT, LEFT_IRIS,
+    NOSE_TIP, RIGHT_CHEEK, RIGHT_EYE_LEFT, RIGHT_EYE_POINTS, RIGHT_EYE_RIGHT, RIGHT_IRIS, face_signals
+)
+from core.postprocess import DetectionFilter
+from sweep import ALL_PARAMS, FILTER_PARAMS, RULE_PARAMS, ReplayClock, replay
+from utils import DetectionCache, DetectionCacheWriter
+
+# Parameter sets checked for parity, on top of the defaults
+PARITY_OVERRIDES = [
+    {},
+    {"look_away_yaw": 0.15, "gaze_left": -0.1, "gaze_right": 0.1},
+    {"look_away_yaw": 0.25, "look_up_pitch": -0.15},
+]
+
+W, H = 640, 480
+
+NAMES = {
+    "person": {0: "person", 1: "bicycle", 2: "car"},
+    "cheat": {0: "person", 1: "cell_phone", 2: "book", 3: "headphone", 4: "earbud"},
+}
+
+
+def _boxes(rng, count, class_ids):
+    x1 = rng.uniform(0, 500, count)
+    y1 = rng.uniform(0, 350, count)
+    size = rng.uniform(20, 200, (count, 2))
+    boxes = np.stack([x1, y1, x1 + size[:, 0], y1 + size[:, 1]], axis=1).astype(np.float32)
+    conf = rng.uniform(0.05, 0.95, count).astype(np.float32)
+    return boxes, conf, np.asarray(class_ids, dtype=int)
+
+
+def _face_landmarks(cx, cy, width, height, nose_dx, nose_dy, iris_dx, eye_open):
+    """
+    FaceMesh-like landmarks (normalized, by landmark id) of one face on integer pixels, laid out so face_signals gives
+        yaw = nose_dx / width, pitch = nose_dy / height, gaze = iris_dx / 20, ear = eye_open / 10
+    Ratios of integer pixels hit the thresholds exactly (30 / 150 = 0.2, 3 / 20 = 0.15), as live.
+    """
+    left, top = cx - width // 2, cy - height // 2
+    cx, cy = left + width // 2, top + height // 2
+    eye_y = top + height // 3
+    at = {
+        NOSE_TIP: (cx + nose_dx, cy + nose_dy),
+        LEFT_CHEEK: (left, cy), RIGHT_CHEEK: (left + width, cy),
+        FOREHEAD: (cx, top), CHIN: (cx, top + height),
+    }
+    for eye_x, corners, iris, points in (
+        (cx - width // 4, (LEFT_EYE_LEFT, LEFT_EYE_RIGHT), LEFT_IRIS, LEFT_EYE_POINTS),
+        (cx + width // 4, (RIGHT_EYE_LEFT, RIGHT_EYE_RIGHT), RIGHT_IRIS, RIGHT_EYE_POINTS),
+    ):
+        at[corners[0]], at[corners[1]] = (eye_x - 10, eye_y), (eye_x + 10, eye_y)
+        at[iris] = (eye_x + iris_dx, eye_y)
+        # EAR points: p0 / p3 corners, p1 p2 upper lid, p4 p5 lower lid
+        at[points[1]], at[points[2]] = (eye_x - 3, eye_y - eye_open), (eye_x + 3, eye_y - eye_open)
+        at[points[4]], at[points[5]] = (eye_x + 3, eye_y + eye_open), (eye_x - 3, eye_y + eye_open)
+
+    # Pixel centers, so face_signals' int(x * w) lands back on the same pixel
+    return {lm: SimpleNamespace(x=(x + 0.5) / W, y=(y + 0.5) / H) for lm, (x, y) in at.items()}
+
+
+def synthetic_session(frames, fps=30.0, seed=0):
+    """
+    (timestamp, raw, signals) per frame, shaped like ObjectDetector.detect_raw /
+    HeadPoseDetector.measure. Head signals come from face_signals on integer pixel
+    landmarks, with slow random walks in pixels so alerts actually fire.
+    """
+    rng = np.random.default_rng(seed)
+    nose_dx = nose_dy = iris_dx = 0
+    session = []
+
+    for i in range(frames):
+        people = rng.choice([0, 1, 1, 1, 2])
+        objects = rng.integers(0, 3)
+        raw = {
+            "person": _boxes(rng, people, rng.choice([0, 0, 0, 2], people)),
+            "cheat": _boxes(rng, objects, rng.integers(0, 5, objects)),
+        }
+
+        # Candidate: 150 x 190 (+-10) face at the center, nose / iris walk in whole pixels
+        width = 150 + int(rng.choice([-10, 0, 0, 10]))
+        height = 190 + int(rng.choice([-10, 0, 0, 10]))
+        nose_dx = int(np.clip(nose_dx + rng.integers(-4, 5), -60, 60))
+        nose_dy = int(np.clip(nose_dy + rng.integers(-3, 4), -45, 45))
+        iris_dx = int(np.clip(iris_dx + rng.integers(-1, 2), -6, 6))
+        faces = [_face_landmarks(320, 240, width, height, nose_dx, nose_dy, iris_dx, 1 if rng.random() < 0.08 else 3)]
+
+        # A second, smaller face further back now and then
+        if rng.random() < 0.12:
+            faces.append(_face_landmarks(
+                int(rng.integers(100, 540)), int(rng.integers(100, 380)), 70, 90,
+                int(rng.integers(-20, 21)), int(rng.integers(-15, 16)), int(rng.integers(-5, 6)), 3
+            ))
+
+        signals = None if rng.random() < 0.01 else [face_signals(face, W, H) for face in faces]
+        session.append((i / fps, raw, signals))
+
+    return session
+
+
+def run(session, names, params):
+    """
+    main.py's per-frame loop (filter, head pose rules, ProctorSession.step), fired alert keys per frame
+    """
+    clock = ReplayClock()
+    detection_filter = DetectionFilter(**{k: params[k] for k in FILTER_PARAMS})
+    rules = HeadPoseRules(**{k: params[k] for k in RULE_PARAMS})
+    proctor = ProctorSession(
+        config.COOLDOWN_SECONDS,
+        config.RESET_COOLDOWN_SECONDS,
+        config.LOOKING_AWAY_THRESHOLD,
+        config.OBJECT_WINDOW,
+        config.OBJECT_MIN_VOTES,
+        (config.FAKE_WINDOW, config.SAMPLE_INTERVAL, config.MIN_VARIANCE,
+         config.NO_BLINK_TIMEOUT, config.LIVENESS_WEIGHTS),
+        clock=clock
+    )
+
+    fired = []
+    for t, raw, signals in session:
+        clock.now = t
+        _, keys = proctor.step(detection_filter.apply(raw, names), rules.evaluate(signals))
+        fired.append(keys)
+    return fired
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    session = synthetic_session(args.frames)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = DetectionCacheWriter(NAMES)
+        for t, raw, signals in session:
+            writer.add(t, raw, signals)
+        cache = DetectionCache(writer.save(os.path.join(tmp, "synthetic.npz")))
+        frames = list(cache.frames())
+
+    # Frame by frame: in-memory outputs vs the same outputs after the cache round trip,
+    # for the defaults and threshold values a sweep typically tries
+    for overrides in PARITY_OVERRIDES:
+        params = {**ALL_PARAMS, **overrides}
+        live = run(session, NAMES, params)
+        cached = run(frames, cache.names, params)
+        for i, (expected, got) in enumerate(zip(live, cached)):
+            if expected != got:
+                print(f"MISMATCH {overrides} at frame {i}: live {expected}, cache {got}")
+                sys.exit(1)
+
+        # sweep.replay totals must agree with the live run
+        expected_counts = Counter(key for keys in live for key in keys)
+        counts = replay(frames, cache.names, params)
+        if counts != expected_counts:
+            print(f"MISMATCH in sweep.replay {overrides}\n  live:   {dict(expected_counts)}\n  replay: {dict(counts)}")
+            sys.exit(1)
+
+        print(f"live == replay {overrides or 'defaults'}: {sum(counts.values())} alerts over {len(frames)} frames"
+              f" {dict(sorted(counts.items()))}")
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        replay(frames, cache.names, ALL_PARAMS)
+        best = min(best, (time.perf_counter() - start) / len(frames) * 1e6)
+    print(f"replay: {best:.1f} us/frame (one combination, one core)")
+
+
+if __name__ == "__main__":
+    main()
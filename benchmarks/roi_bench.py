@@ -0,0 +1,84 @@
+"""
+Cost of the ROI pass (cheat_model on head / hands crops) against the full-frame
+cheat_model pass, on a synthetic frame with synthetic person boxes, through
+ObjectDetector itself. Inference time does not depend on the image content, so
+the frame is noise; pass the real weights (or the same architecture as .yaml).
+
+    python -m benchmarks.roi_bench --width 1920 --height 1080 --cheat-model YOLO_fineTune_v3.pt
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from detectors import ObjectDetector
+
+
+def person_raw(detector, w, h, people):
+    """
+    Boxes of a candidate close to the camera (and a second person), in detect_raw layout
+    """
+    names = detector.names["person"]
+    person_id = next((k for k, v in names.items() if v == "person"), None)
+    if person_id is None:
+        # Architecture-only model (.yaml) has numeric class names
+        person_id = 0
+        detector.names["person"] = {**names, 0: "person"}
+
+    boxes = [(0.3 * w, 0.1 * h, 0.7 * w, h - 1), (0.75 * w, 0.3 * h, 0.95 * w, h - 1)][:people]
+    return (
+        np.array(boxes, dtype=np.float32).reshape(-1, 4),
+        np.full(len(boxes), 0.9, dtype=np.float32),
+        np.full(len(boxes), person_id, dtype=int),
+    )
+
+
+def timed(fn, runs):
+    for _ in range(3):
+        fn()
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--person-model", default="yolov8s.pt")
+    parser.add_argument("--cheat-model", default="YOLO_fineTune_v3.pt")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--people", type=int, default=1, choices=[1, 2])
+    parser.add_argument("--roi-size", type=int, default=320)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    detector = ObjectDetector(
+        person_model=args.person_model,
+        cheat_model=args.cheat_model,
+        roi_pass=True,
+        roi_size=args.roi_size
+    )
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, size=(args.height, args.width, 3), dtype=np.uint8)
+    people = person_raw(detector, args.width, args.height, args.people)
+    rois = detector._roi_boxes(people, frame.shape)
+    side = rois[0][2] - rois[0][0] if rois else detector.roi_size
+
+    full_ms = timed(lambda: detector._run_model(detector.cheat_model, frame), args.runs)
+    roi_ms = timed(lambda: detector._run_roi(frame, people), args.runs)
+
+    print(
+        f"{args.width}x{args.height}: full frame at imgsz {detector.full_imgsz}"
+        f" (scale {detector.full_imgsz / max(args.width, args.height):.2f}) {full_ms:6.1f} ms"
+        f" | ROI pass {len(rois)} x {side}px crops (scale 1.00) {roi_ms:6.1f} ms"
+        f" ({roi_ms / full_ms:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Records unfiltered YOLO outputs and raw head pose signals for recorded sessions,
+so thresholds can be tuned with sweep.py without rerunning the models.
+
+    python build_cache.py recordings/*.mp4 --out cache/
+"""
+import argparse
+import os
+
+import cv2
+import mediapipe as mp
+import ultralytics
+
+from config import MAX_NUM_FACES, ROI_SIZE
+from detectors import HeadPoseDetector, ObjectDetector
+from detectors.object_detector import HEAD_WIDTH_RATIO, ROI_MARGIN
+from utils import DetectionCacheWriter, FrameBufferPool
+from utils.detection_cache import cache_path, file_fingerprint, model_version
+
+
+def build(video_path, detector, out_dir, version):
+    path = cache_path(out_dir, video_path, version)
+    if os.path.exists(path):
+        print(f"{video_path}: cached ({path})")
+        return path
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Could not open {video_path}")
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    # New FaceMesh per video, its tracking state must not carry over between recordings
+    pool = FrameBufferPool()
+    head_pose_detector = HeadPoseDetector(pool=pool, max_num_faces=MAX_NUM_FACES)
+    writer = DetectionCacheWriter(detector.names)
+
+    frame = None
+    index = 0
+    while True:
+        ok, frame = cap.read(frame)
+        if not ok:
+            break
+
+        raw = detector.detect_raw(frame)
+        signals, _ = head_pose_detector.measure(frame)
+
+        # Video time, not wall time, drives the trackers on replay
+        writer.add(index / fps, raw, signals)
+        index += 1
+
+    cap.release()
+
+    writer.save(path, meta={"video": os.path.basename(video_path), "fps": fps, "model_version": version})
+    print(f"{video_path}: {index} frames -> {path}")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("videos", nargs="+")
+    parser.add_argument("--out", default="cache")
+    parser.add_argument("--person-model", default="yolov8s.pt")
+    parser.add_argument("--cheat-model", default="YOLO_fineTune_v3.pt")
+    parser.add_argument("--raw-conf", type=float, default=0.05,
+                        help="confidence floor passed to YOLO, thresholds below this cannot be swept")
+    parser.add_argument("--roi-pass", action="store_true",
+                        help="also record cheat_model on head / hands crops (ObjectDetector roi_pass). "
+                             "Crops follow the people found at the detector's person_conf, a person_conf "
+                             "sweep does not move them")
+    args = parser.parse_args()
+
+    detector = ObjectDetector(
+        person_model=args.person_model,
+        cheat_model=args.cheat_model,
+        raw_conf=args.raw_conf,
+        roi_pass=args.roi_pass,
+        roi_size=ROI_SIZE
+    )
+
+    version = model_version(
+        file_fingerprint(args.person_model),
+        file_fingerprint(args.cheat_model),
+        args.raw_conf,
+        ultralytics.__version__,
+        mp.__version__,
+        MAX_NUM_FACES,
+        # ROI crops are placed on the people found at this person_conf
+        args.roi_pass and (ROI_SIZE, HEAD_WIDTH_RATIO, ROI_MARGIN, detector.filter.person_conf)
+    )
+
+    for video_path in args.videos:
+        build(video_path, detector, args.out, version)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,4 +16,19 @@ LIVENESS_WEIGHTS = {
 }
 
 OBJECT_WINDOW = 15        # frames
-OBJECT_MIN_VOTES = 5      # must appear in 5 of last 15 frames
\ No newline at end of file
+OBJECT_MIN_VOTES = 5      # must appear in 5 of last 15 frames
+
+MAX_NUM_FACES = 2         # faces tracked by FaceMesh, 2 is enough for multiple_faces. FaceMesh cost grows with this
+                          # even with one face in view (it keeps re-running face detection for the missing ones)
+
+# Second cheat_model pass on head / hands crops at native resolution, for earbuds and phones held low.
+# Only runs on frames larger than the model input (e.g. 720p / 1080p), a 640x480 frame is already at native scale
+ROI_PASS = False
+ROI_SIZE = 320            # px, smallest side of the square crops, they grow to fit a close candidate's head. Each costs about (side / 640)^2 of a full-frame pass
+
+# Frame tracer (Chrome / Perfetto trace JSON)
+TRACE_ENABLED = False
+TRACE_BUFFER_SIZE = 20000  # spans kept in the ring buffer
+TRACE_SLOW_FRAME_MS = 500  # auto dump when a frame takes longer than this
+TRACE_SLOW_DUMP_COOLDOWN = 30  # seconds, at most one automatic dump per this interval
+TRACE_OUTPUT_DIR = "traces"
\ No newline at end of file
@@ -1,5 +1,7 @@
 from .alert_engine import AlertEngine
+from .head_pose_rules import HeadPoseRules
 from .head_tracker import HeadTracker
 from .liveness import LivenessDetector
 from .object_tracker import ObjectTemporalTracker
-__all__ = ["AlertEngine", "HeadTracker", "LivenessDetector", "ObjectTemporalTracker"]
\ No newline at end of file
+from .session import ProctorSession
+__all__ = ["AlertEngine", "HeadPoseRules", "HeadTracker", "LivenessDetector", "ObjectTemporalTracker", "ProctorSession"]
\ No newline at end of file
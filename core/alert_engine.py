@@ -1,14 +1,18 @@
 import time
 
 class AlertEngine:
-    def __init__(self, alert_manager, states, cooldown, reset_cooldown):
+    def __init__(self, alert_manager, states, cooldown, reset_cooldown, clock=time.time):
         self.alert_manager = alert_manager
         self.states = states
         self.cooldown = cooldown
         self.reset_cooldown = reset_cooldown
+        self.clock = clock
 
     def trigger(self, key, condition):
-        now = time.time()
+        """
+        returns True when a new alert was raised for key
+        """
+        now = self.clock()
         state = self.states[key]
 
         if condition:
@@ -16,6 +20,9 @@ class AlertEngine:
                 self.alert_manager.add_alert(state["message"])
                 state["active"] = True
                 state["last_alert"] = now  
+                return True
         else:
             if state["active"] and (now - state["last_alert"]) > self.reset_cooldown:
                 state["active"] = False
+
+        return False
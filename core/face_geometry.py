@@ -0,0 +1,94 @@
+import math
+
+# MediaPipe FaceMesh landmark IDs
+NOSE_TIP = 1
+LEFT_CHEEK = 234
+RIGHT_CHEEK = 454
+FOREHEAD = 10
+CHIN = 152
+
+# Left eye
+LEFT_EYE_LEFT = 33
+LEFT_EYE_RIGHT = 133
+LEFT_IRIS = 468
+
+# Right eye
+RIGHT_EYE_LEFT = 362
+RIGHT_EYE_RIGHT = 263
+RIGHT_IRIS = 473
+
+# Eye landmarks used for the Eye Aspect Ratio
+LEFT_EYE_POINTS = [33, 160, 158, 133, 153, 144]
+RIGHT_EYE_POINTS = [362, 385, 387, 263, 373, 380]
+
+
+def _dist(p1, p2):
+    return math.hypot(p1[0] - p2[0], p1[1] - p2[1])
+
+
+def eye_aspect_ratio(eye):
+    A = _dist(eye[1], eye[5])
+    B = _dist(eye[2], eye[4])
+    C = _dist(eye[0], eye[3])
+    return (A + B) / (2.0 * C + 1e-6)
+
+
+def face_signals(landmarks, w, h):
+    """
+    Head pose / gaze / EAR of one face, no thresholds applied.
+
+    landmarks: FaceMesh .landmark of one face (normalized 0-1)
+    Returns dict: yaw, pitch, gaze, ear, face_width, face_height, center_x, center_y
+    """
+    # Convert only required points
+    def px(i):
+        lm = landmarks[i]
+        return int(lm.x * w), int(lm.y * h)
+
+    nose = px(NOSE_TIP)
+    left_cheek = px(LEFT_CHEEK)
+    right_cheek = px(RIGHT_CHEEK)
+    forehead = px(FOREHEAD)
+    chin = px(CHIN)
+
+    # Face geometry
+    face_width = max(1, right_cheek[0] - left_cheek[0])
+    face_height = max(1, chin[1] - forehead[1])
+    face_center_x = (left_cheek[0] + right_cheek[0]) // 2
+    face_center_y = (forehead[1] + chin[1]) // 2
+
+    """
+    Head pose: nose displacement from the face center, normalized by face width / height
+        yaw ≈0 straight, + looking right, - looking left
+    """
+    yaw_ratio = (nose[0] - face_center_x) / face_width
+    pitch_ratio = (nose[1] - face_center_y) / face_height
+
+    # Eye landmarks, the corners are p0 / p3 of the EAR points
+    left_eye = [px(i) for i in LEFT_EYE_POINTS]
+    right_eye = [px(i) for i in RIGHT_EYE_POINTS]
+
+    # Gaze: iris displacement from the eye center, normalized by eye width
+    le_left, le_right, le_iris = left_eye[0], left_eye[3], px(LEFT_IRIS)
+    re_left, re_right, re_iris = right_eye[0], right_eye[3], px(RIGHT_IRIS)
+
+    left_eye_width = max(1, le_right[0] - le_left[0])
+    right_eye_width = max(1, re_right[0] - re_left[0])
+
+    left_gaze = (le_iris[0] - (le_left[0] + le_right[0]) // 2) / left_eye_width
+    right_gaze = (re_iris[0] - (re_left[0] + re_right[0]) // 2) / right_eye_width
+    gaze_ratio = (left_gaze + right_gaze) / 2
+
+    # Eye Aspect Ratio
+    ear = (eye_aspect_ratio(left_eye) + eye_aspect_ratio(right_eye)) / 2.0
+
+    return {
+        "yaw": yaw_ratio,
+        "pitch": pitch_ratio,
+        "gaze": gaze_ratio,
+        "ear": ear,
+        "face_width": face_width,
+        "face_height": face_height,
+        "center_x": face_center_x,
+        "center_y": face_center_y,
+    }
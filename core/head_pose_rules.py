@@ -0,0 +1,159 @@
+# Head pose thresholds + blink state, applied to signals measured from face landmarks.
+# Kept free of MediaPipe so recorded signals can be re-evaluated offline.
+import math
+
+NO_FACE = (False, False, False, False, False, False, 0.0, 0.0, 0.0, 0, False, 0, 0)
+
+
+class HeadPoseRules:
+    def __init__(self,
+                 look_away_yaw=0.2,
+                 look_down_pitch=0.13,
+                 look_up_pitch=-0.1,
+                 gaze_left=-0.15,
+                 gaze_right=0.15,
+                 ear_threshold=0.20,
+                 blink_frames=2,
+                 min_face_width=80,
+                 min_face_height=100,
+                 ):
+
+        # Head  Pose Thresholds
+        self.LOOK_AWAY_YAW = look_away_yaw
+        self.LOOK_DOWN_PITCH = look_down_pitch
+        self.LOOK_UP_PITCH = look_up_pitch
+        self.GAZE_LEFT = gaze_left
+        self.GAZE_RIGHT = gaze_right
+
+        # Face Size Constraints
+        self.MIN_FACE_WIDTH = min_face_width
+        self.MIN_FACE_HEIGHT = min_face_height
+
+        # Blink config
+        self.EAR_THRESHOLD = ear_threshold #(Eye Aspect Ratio) : measures how open the eye is
+        self.BLINK_FRAMES = blink_frames
+
+        # Blink state, one entry per face of the previous frame
+        self.blink_counters = []
+        self.centers = []
+
+        # Previous-frame index of the candidate (primary face), -1 when there was none
+        self.primary = -1
+
+        # Blinks of the candidate (primary face)
+        self.total_blinks = 0
+
+    def _reset_faces(self):
+        self.blink_counters = []
+        self.centers = []
+        self.primary = -1
+
+    def _match_faces(self, centers, widths):
+        """
+        Index of the previous-frame face each current face continues (-1 for a new face).
+        Greedy nearest center, a face cannot move more than its own width between frames.
+        """
+        match = [-1] * len(centers)
+        if not self.centers:
+            return match
+
+        # Common case: one face now and before
+        if len(centers) == 1 and len(self.centers) == 1:
+            (x, y), (px, py) = centers[0], self.centers[0]
+            if math.hypot(x - px, y - py) <= widths[0]:
+                match[0] = 0
+            return match
+
+        pairs = sorted(
+            (math.hypot(x - px, y - py), i, j)
+            for i, (x, y) in enumerate(centers)
+            for j, (px, py) in enumerate(self.centers)
+        )
+        taken = set()
+        for dist, i, j in pairs:
+            if match[i] != -1 or j in taken or dist > widths[i]:
+                continue
+            match[i] = j
+            taken.add(j)
+
+        return match
+
+    def evaluate(self, signals):
+        """
+        signals: list of per-face face_signals dicts (HeadPoseDetector.measure),
+                 or None when no face was found
+
+        Head pose flags are for the primary face (the candidate), blinks are tracked for every face.
+        The primary face is the largest one (closest to the camera) when first seen, then stays on
+        the same face track, so a helper leaning in does not take over. Re-picked by size only when
+        that track is lost.
+
+        Returns:
+            (looking_away, looking_down, looking_up, looking_left, looking_right, partial_face,
+             yaw, pitch, gaze, ear, blinked, total_blinks, face_count)
+        """
+        if not signals:
+            self._reset_faces()
+            return NO_FACE
+
+        centers = [(face["center_x"], face["center_y"]) for face in signals]
+        match = self._match_faces(centers, [face["face_width"] for face in signals])
+
+        # Candidate = primary face, followed through the matched track
+        if len(signals) == 1:
+            primary = 0
+        elif self.primary >= 0 and self.primary in match:
+            primary = match.index(self.primary)
+        else:
+            primary = max(range(len(signals)), key=lambda i: signals[i]["face_width"] * signals[i]["face_height"])
+
+        # Blink Detection, per face
+        counters = []
+        blinked = False
+        for i, (face, prev) in enumerate(zip(signals, match)):
+            counter = self.blink_counters[prev] if prev >= 0 else 0
+
+            if face["ear"] < self.EAR_THRESHOLD:
+                counter += 1
+            else:
+                if counter >= self.BLINK_FRAMES and i == primary:
+                    self.total_blinks += 1
+                    blinked = True
+                counter = 0
+
+            counters.append(counter)
+
+        self.blink_counters = counters
+        self.centers = centers
+        self.primary = primary
+
+        face = signals[primary]
+        yaw, pitch, gaze = face["yaw"], face["pitch"], face["gaze"]
+
+        partial_face = (
+            face["face_width"] < self.MIN_FACE_WIDTH or
+            face["face_height"] < self.MIN_FACE_HEIGHT
+        )
+
+        looking_away = abs(yaw) > self.LOOK_AWAY_YAW
+        looking_down = pitch > self.LOOK_DOWN_PITCH
+        looking_up = pitch < self.LOOK_UP_PITCH
+
+        looking_left = gaze < self.GAZE_LEFT
+        looking_right = gaze > self.GAZE_RIGHT
+
+        return (
+            looking_away,
+            looking_down,
+            looking_up,
+            looking_left,
+            looking_right,
+            partial_face,
+            yaw,
+            pitch,
+            gaze,
+            face["ear"],
+            blinked,
+            self.total_blinks,
+            len(signals)
+        )
@@ -3,16 +3,16 @@ import cv2
 
 #handles Time based behavior
 class HeadTracker:
-    def __init__(self, states, threshold, debug=False):
+    def __init__(self, states, threshold, debug=False, clock=time.time):
         self.states = states
         self.threshold = threshold
         self.DEBUG = debug
+        self.clock = clock
 
     def process(self, frame, key, condition):
         ret_Val = False
-        now = time.time()
+        now = self.clock()
         this_state = self.states[key]
-        label = key.replace("_", " ").title()
 
         if condition:
 
@@ -28,6 +28,7 @@ class HeadTracker:
             this_state["active"] = False
 
         if self.DEBUG and this_state["start_time"]:
+            label = key.replace("_", " ").title()
             elapsed = now - this_state["start_time"]
             cv2.putText(
                     frame,
@@ -1,18 +1,24 @@
 import time
+from collections import deque
 
 class LivenessDetector:
-    def __init__(self, window, interval, min_variance, blink_timeout, weights):
+    def __init__(self, window, interval, min_variance, blink_timeout, weights, clock=time.time):
         self.window = window
         self.interval = interval
         self.min_variance = min_variance
         self.blink_timeout = blink_timeout
         self.weights = weights
+        self.clock = clock
 
-        self.yaw = []
-        self.pitch = []
-        self.gaze = []
+        self.yaw = deque()
+        self.pitch = deque()
+        self.gaze = deque()
 
-        self.last_blink = time.time()
+        # Variances only change when a sample is added or expires (every `interval`),
+        # so they are cached between those updates instead of recomputed every frame
+        self._variances = None
+
+        self.last_blink = self.clock()
     
     def _variance(self, values):
         if len(values) < 10:
@@ -21,24 +27,32 @@ class LivenessDetector:
         return sum((v - mean) ** 2 for v in values) / len(values)
     
     def update(self, yaw, pitch, gaze, blinked):
-        now = time.time()
+        now = self.clock()
         
         if not self.yaw or now - self.yaw[-1][0] > self.interval:
             self.yaw.append((now, yaw))
             self.pitch.append((now, pitch))
             self.gaze.append((now, gaze))
+            self._variances = None
 
-        self.yaw = [(t,v) for t,v in self.yaw if now - t <= self.window]
-        self.pitch = [(t,v) for t,v in self.pitch if now - t <= self.window]
-        self.gaze = [(t,v) for t,v in self.gaze if now - t <= self.window]
+        # Samples are in time order, expired ones are always at the front
+        while self.yaw and now - self.yaw[0][0] > self.window:
+            self.yaw.popleft()
+            self.pitch.popleft()
+            self.gaze.popleft()
+            self._variances = None
 
         if blinked:
             self.last_blink = now
 
     def is_fake(self):
-        yaw_var = self._variance([v for _, v in self.yaw])
-        pitch_var = self._variance([v for _, v in self.pitch])
-        gaze_var = self._variance([v for _, v in self.gaze])
+        if self._variances is None:
+            self._variances = (
+                self._variance([v for _, v in self.yaw]),
+                self._variance([v for _, v in self.pitch]),
+                self._variance([v for _, v in self.gaze]),
+            )
+        yaw_var, pitch_var, gaze_var = self._variances
 
         score = (
                 self.weights["yaw"] * yaw_var +
@@ -47,7 +61,7 @@ class LivenessDetector:
         )
         static = score < self.min_variance
 
-        no_blink = (time.time() - self.last_blink) > self.blink_timeout
+        no_blink = (self.clock() - self.last_blink) > self.blink_timeout
 
         return static and no_blink, (yaw_var, pitch_var, gaze_var)
 
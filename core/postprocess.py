@@ -0,0 +1,189 @@
+PERSON_CLASSES = {"person"}
+CHEAT_CLASSES = {"person", "cell_phone", "book", "headphone", "earbud"}
+ROI_CLASSES = {"cell_phone", "headphone", "earbud"} # small objects looked for in the head / hands crops
+
+
+def compute_iou(boxA, boxB):
+    """
+    boxA, boxB: (x1, y1, x2, y2)
+    """
+
+    #This computes the overlapping rectangle between two boxes.
+    # If the boxes overlap, these coordinates define the intersection box
+    xA = max(boxA[0], boxB[0])
+    yA = max(boxA[1], boxB[1])
+    xB = min(boxA[2], boxB[2])
+    yB = min(boxA[3], boxB[3])
+
+    #Calculate area of intersection box
+    inter_w = max(0, xB - xA)
+    inter_h = max(0, yB - yA)
+    inter_area = inter_w * inter_h
+
+    #IoU must be 0 if there is no intersection
+    if inter_area == 0:
+        return 0.0
+
+    #computes individual box areas
+    boxA_area = (boxA[2] - boxA[0]) * (boxA[3] - boxA[1])
+    boxB_area = (boxB[2] - boxB[0]) * (boxB[3] - boxB[1])
+
+    # IoU formula
+    """
+    Area(A∩B) / (Area(A)+Area(B)−Area(A∩B))
+    """
+    return inter_area / float(boxA_area + boxB_area - inter_area)
+
+
+def merge_by_class(detections, classes, iou_threshold=0.5):
+
+    final = []
+    used = set()
+
+    # Group detections by class
+    grouped = {}
+
+    for i, d in enumerate(detections):
+        if d["class"] in classes:
+            grouped.setdefault(d["class"], []).append((i, d))
+        else:
+            final.append(d)
+
+
+    for cls, items in grouped.items():
+
+        clusters = []
+
+        for idx, det in items:
+
+            if idx in used:
+                continue
+
+            used.add(idx)
+
+            cluster = [det]
+
+            for jdx, other in items:
+
+                if jdx in used:
+                    continue
+
+                if compute_iou(det["bbox"], other["bbox"]) >= iou_threshold:
+                    cluster.append(other)
+                    used.add(jdx)
+
+            clusters.append(cluster)
+
+        # Keep largest from each cluster
+        for cluster in clusters:
+
+            best = max(
+                cluster,
+                key=lambda d: (d["bbox"][2] - d["bbox"][0]) *
+                              (d["bbox"][3] - d["bbox"][1])
+            )
+
+            final.append(best)
+
+    return final
+
+
+def filter_boxes(boxes, confs, class_ids, names, allowed_classes, class_thresholds, default_conf):
+    """
+    Applies class + confidence filtering to raw model output.
+    boxes (N, 4) xyxy, confs (N,), class_ids (N,) as returned by the model.
+    Shared by the live detector and offline replay of cached outputs.
+    """
+    detections = []
+
+    for (x1, y1, x2, y2), conf, cls_id in zip(boxes, confs, class_ids):
+        name = names[int(cls_id)]
+        conf = float(conf)
+
+        if name not in allowed_classes:
+            continue
+
+        threshold = class_thresholds.get(name, default_conf)
+
+        if conf < threshold:
+            continue
+
+        detections.append({
+            "class": name,
+            "confidence": conf,
+            "bbox": (int(x1), int(y1), int(x2), int(y2))
+        })
+
+    return detections
+
+
+class DetectionFilter:
+    """
+    Per-class confidence thresholds for both models. Works on the output of
+    ObjectDetector.detect_raw, live or loaded from a DetectionCache.
+    """
+
+    def __init__(self,
+                 default_conf=0.5,
+                 person_conf=0.5,
+                 book_conf=0.4,
+                 phone_conf=0.6,
+                 audio_conf=0.5,
+                 ):
+
+        # Thresholds
+        self.default_conf = default_conf
+        self.person_conf = person_conf
+        self.class_thresholds = {
+            "cell_phone": phone_conf,
+            "book": book_conf,
+            "headphone": audio_conf,
+            "earbud": audio_conf,
+        }
+
+    def apply(self, raw, names):
+        """
+        raw / names: dicts keyed "person" / "cheat", plus "roi" when the ROI pass ran
+        """
+        # 1️⃣ Person detection
+        person_dets = filter_boxes(
+            *raw["person"],
+            names["person"],
+            PERSON_CLASSES,
+            self.class_thresholds,
+            self.person_conf
+        )
+
+        # 2️⃣ Cheating objects
+        cheat_dets = filter_boxes(
+            *raw["cheat"],
+            names["cheat"],
+            CHEAT_CLASSES,
+            self.class_thresholds,
+            self.default_conf
+        )
+
+        # 3️⃣ High resolution head / hands crops, already in frame coordinates.
+        # Only adds objects the full frame pass missed: an ROI box matching a full frame box is dropped,
+        # full frame boxes are never merged with each other here
+        if "roi" in raw:
+            roi_dets = filter_boxes(
+                *raw["roi"],
+                names["roi"],
+                ROI_CLASSES,
+                self.class_thresholds,
+                self.default_conf
+            )
+            if roi_dets:
+                # Crops of two people can overlap and find the same object twice
+                roi_dets = merge_by_class(roi_dets, ROI_CLASSES, iou_threshold=0.5)
+                cheat_dets = cheat_dets + [
+                    d for d in roi_dets
+                    if not any(
+                        o["class"] == d["class"] and compute_iou(o["bbox"], d["bbox"]) >= 0.5
+                        for o in cheat_dets
+                    )
+                ]
+
+        # Merge
+        return person_dets + cheat_dets
@@ -0,0 +1,151 @@
+import time
+
+from utils.alerts import AlertManager
+from utils.tracer import FrameTracer
+from .alert_engine import AlertEngine
+from .head_tracker import HeadTracker
+from .liveness import LivenessDetector
+from .object_tracker import ObjectTemporalTracker
+from .postprocess import merge_by_class
+
+
+def default_states():
+    return {
+    "phone" : {"active":False, "last_alert":0, "message":"ALERT: Mobile phone detected"},
+    "multiple_people" : {"active":False, "last_alert":0, "message":"ALERT: Multiple people detected"},
+    "multiple_faces" : {"active":False, "last_alert":0, "message":"ALERT: Multiple faces detected"},
+    "no_person" : {"active":False, "last_alert":0, "message":"ALERT: No person present"},
+    "book" : {"active":False, "last_alert":0, "message":"ALERT: Book detected"},
+    "headphone" : {"active":False, "last_alert":0, "message":"ALERT: Headphone detected"},
+    "earbud" : {"active":False, "last_alert":0, "message":"ALERT: Earbud detected"},
+    
+    "looking_away": {"active": False, "last_alert": 0, "start_time": None, "message":"ALERT: Candidate is not facing the screen"},
+    "looking_down": {"active": False, "last_alert": 0, "start_time": None, "message":"ALERT: Candidate is looking down for extended duration"},
+    "looking_up": {"active": False, "last_alert": 0, "start_time": None, "message":"ALERT: Candidate is looking up for extended duration"},
+    "looking_side": {"active": False, "last_alert": 0, "start_time": None, "message": "ALERT: Candidate is looking away from the screen (eye gaze detected)"},
+    "face_hidden": {"active": False, "last_alert": 0, "start_time": None, "message": "ALERT: Face not clearly visible (possible obstruction)"},
+    "partial_face": {"active": False, "last_alert": 0, "start_time": None, "message": "ALERT: Face appears too small (candidate may be too far from camera)"},
+    "fake_presence": {"active": False, "last_alert": 0, "start_time": None, "message": "ALERT: Possible fake presence detected (no eye blink / low movement)"}
+    }
+
+
+# Post-processing, tracking and alert logic for one candidate. Takes detector outputs,
+# so the same code runs live (main.py) and on cached raw outputs (sweep.py)
+class ProctorSession:
+    def __init__(self,
+                 cooldown,
+                 reset_cooldown,
+                 looking_away_threshold,
+                 object_window,
+                 object_min_votes,
+                 liveness_args,
+                 debug=False,
+                 tracer=None,
+                 clock=time.time,
+                 ):
+
+        self.states = default_states()
+        self.tracer = tracer or FrameTracer()
+
+        self.alert_manager = AlertManager(clock=clock)
+        self.alerts = AlertEngine(self.alert_manager, self.states, cooldown, reset_cooldown, clock=clock)
+        self.tracker = HeadTracker(self.states, looking_away_threshold, debug=debug, clock=clock)
+        self.liveness = LivenessDetector(*liveness_args, clock=clock)
+        self.object_tracker = ObjectTemporalTracker(
+            window=object_window,
+            min_votes=object_min_votes
+        )
+
+    def step(self, raw, head, canvas=None):
+        """
+        raw: filtered detections from ObjectDetector (before merging)
+        head: HeadPoseDetector.detect / HeadPoseRules.evaluate tuple
+        canvas: overlay for debug timers
+
+        Returns merged detections and the keys that raised an alert this frame
+        """
+        fired = []
+
+        def trigger(key, condition):
+            if self.alerts.trigger(key, condition):
+                fired.append(key)
+
+        with self.tracer.span("merge_by_class"):
+            detections = (merge_by_class(
+                raw,
+                ["person", "earbud"],
+                iou_threshold=0.5
+            ) if len(raw) > 1 else raw)
+
+        (
+            looking_away,
+            looking_down,
+            looking_up,
+            looking_left,
+            looking_right,
+            partial_face,
+            yaw,
+            pitch,
+            gaze,
+            _,
+            blinked,
+            _,
+            face_count
+        ) = head
+
+        with self.tracer.span("track_and_alert"):
+            #Liveness
+            self.liveness.update(yaw, pitch, gaze, blinked)
+            fake, _ = self.liveness.is_fake()
+
+            #Object Flags (single pass)
+            phone = book = headphone = earbud = False
+            people_count = 0
+
+            for d in detections:
+                cls = d["class"]
+                if cls == "person":
+                    people_count += 1
+                elif cls == "cell_phone":
+                    phone = True
+                elif cls == "book":
+                    book = True
+                elif cls == "headphone":
+                    headphone = True
+                elif cls == "earbud":
+                    earbud = True
+
+            #Head Movement Conditions
+            face_hidden_condition = not (yaw or pitch or gaze) and people_count == 0
+            head_conditions = {
+                "looking_away": looking_away,
+                "looking_down": looking_down,
+                "looking_up": looking_up,
+                "looking_side": looking_left or looking_right,
+                "partial_face": partial_face,
+                "face_hidden": face_hidden_condition,
+                "fake_presence": fake
+            }
+
+            for key, cond in head_conditions.items():
+                triggered = self.tracker.process(canvas, key, cond)
+                trigger(key, triggered)
+
+            #Object Stability
+            object_flags = {
+                "phone": phone,
+                "book": book,
+                "headphone": headphone,
+                "earbud": earbud
+            }
+            for key, present in object_flags.items():
+                stable = self.object_tracker.update(key, present)
+                trigger(key, stable)
+
+            # A second face (e.g. someone leaning in) needs the same temporal voting, FaceMesh can flicker
+            trigger("multiple_faces", self.object_tracker.update("multiple_faces", face_count > 1))
+
+            trigger("multiple_people", people_count > 1)
+            # trigger("no_person", people_count == 0)
+
+        return detections, fired
@@ -1,3 +1,4 @@
-from .object_detector import ObjectDetector, merge_by_class
+from core.postprocess import merge_by_class
+from .object_detector import ObjectDetector
 from .head_pose_detector import HeadPoseDetector
 __all__ = ["ObjectDetector", "merge_by_class", "HeadPoseDetector"]
\ No newline at end of file
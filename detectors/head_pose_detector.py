@@ -1,234 +1,137 @@
 import cv2
-import math
 import mediapipe as mp
 
+from core.face_geometry import (
+    CHIN, FOREHEAD, LEFT_CHEEK, LEFT_EYE_POINTS, LEFT_IRIS, NOSE_TIP, RIGHT_CHEEK, RIGHT_EYE_POINTS, RIGHT_IRIS,
+    face_signals
+)
+from core.head_pose_rules import HeadPoseRules
+from utils.buffer_pool import FrameBufferPool
+from utils.tracer import FrameTracer
+
+DRAWN_LANDMARKS = (NOSE_TIP, LEFT_IRIS, RIGHT_IRIS, LEFT_CHEEK, RIGHT_CHEEK, FOREHEAD, CHIN, *LEFT_EYE_POINTS, *RIGHT_EYE_POINTS)
+
 class HeadPoseDetector:
-    def __init__(self, debug=False):
+    def __init__(self, debug=False, tracer=None, pool=None, rules=None, max_num_faces=1):
         self.face_mesh = mp.solutions.face_mesh.FaceMesh( #Creates the actual face detector.
             static_image_mode = False, #False = video mode. Enables tracking across frames.
-            max_num_faces=1, #Detect only one face
+            max_num_faces=max_num_faces, #More than one lets a second face (e.g. a helper leaning in) be flagged
             refine_landmarks=True, # Enables high-precision landmarks
             min_detection_confidence=0.5, #Minimum confidence to detect face
             min_tracking_confidence=0.5 #Confidence needed to track face between frames : Avoids flickering
-        ) 
+        )
         self.DEBUG = debug
+        self.tracer = tracer or FrameTracer()
+        self.pool = pool or FrameBufferPool()
 
-        #IDs of specific face points
-        self.NOSE_TIP = 1
-        self.LEFT_CHEEK = 234
-        self.RIGHT_CHEEK = 454
-        self.FOREHEAD = 10
-        self.CHIN = 152
-
-        # Left eye
-        self.LEFT_EYE_LEFT = 33
-        self.LEFT_EYE_RIGHT = 133
-        self.LEFT_IRIS = 468
-
-        # Right eye
-        self.RIGHT_EYE_LEFT = 362
-        self.RIGHT_EYE_RIGHT = 263
-        self.RIGHT_IRIS = 473
-
-        # Face Size Constraints
-        self.MIN_FACE_WIDTH = 80
-        self.MIN_FACE_HEIGHT = 100
-
-
-        # Eye landmarks (MediaPipe)
-        self.LEFT_EYE_POINTS = [33, 160, 158, 133, 153, 144]
-        self.RIGHT_EYE_POINTS = [362, 385, 387, 263, 373, 380]
-
-        # Blink config
-        self.EAR_THRESHOLD = 0.20 #(Eye Aspect Ratio) : measures how open the eye is
-        self.BLINK_FRAMES = 2
-        self.blink_counter = 0
-        self.total_blinks = 0
-
-        # Head  Pose Thresholds
-        self.LOOK_AWAY_YAW = 0.2
-        self.LOOK_DOWN_PITCH = 0.13
-        self.LOOK_UP_PITCH = -0.1
-        self.GAZE_LEFT = -0.15
-        self.GAZE_RIGHT = 0.15
-    
-
-    # Utility Functions
-    @staticmethod
-    def _dist(p1, p2):
-        return math.hypot(p1[0] - p2[0], p1[1] - p2[1])
-
-    def _eye_aspect_ratio(self, eye):
-        A = self._dist(eye[1], eye[5])
-        B = self._dist(eye[2], eye[4])
-        C = self._dist(eye[0], eye[3])
-        return (A + B) / (2.0 * C + 1e-6)
-
-    def detect(self, frame, draw=True):
+        # Yaw / pitch / gaze / face size thresholds and blink state
+        self.rules = rules or HeadPoseRules()
+
+    def measure(self, frame):
         """
+        Runs FaceMesh and computes the raw landmark-derived signals for every face, no thresholds applied.
+
         Returns:
-            - looking_away (bool)
-            - yaw_ratio (float)
+            - signals (list of face_signals dicts, one per face. None when no face is found)
+            - faces (FaceMesh landmarks of every face, used for debug drawing)
         """
         h, w = frame.shape[:2]
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) #OpenCV uses BGR -> MediaPipe needs RGB
-        
+
+        #OpenCV uses BGR -> MediaPipe needs RGB. Converted into a reused buffer instead of a new array per frame
+        rgb = self.pool.like("rgb", frame)
+        rgb.flags.writeable = True
+        with self.tracer.span("cvtColor"):
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+        rgb.flags.writeable = False #read-only input lets MediaPipe use the buffer without copying it
+
         #Run the model
-        results = self.face_mesh.process(rgb) #finds face, computes 468 landmarks, stores them in results
+        with self.tracer.span("face_mesh.process"):
+            results = self.face_mesh.process(rgb) #finds faces, computes 478 landmarks each, stores them in results
 
         #no face detected
         if not results.multi_face_landmarks:
-            self.blink_counter = 0
-            return (False, False, False, False, False, False,0.0, 0.0, 0.0,0,False,0)
-        
+            return None, None
+
         """
         multi_face_landmarks → list of faces
-        [0] → first face
-        .landmark → list of 468 points and Each point has : .x , .y , .z   (normalized 0-1)
+        .landmark → list of 478 points and Each point has : .x , .y , .z   (normalized 0-1)
         """
-        landmarks = results.multi_face_landmarks[0].landmark
-
-        # Convert only required points
-        def px(i):
-            return int(landmarks[i].x * w), int(landmarks[i].y * h)
-        
-        nose = px(self.NOSE_TIP)
-        left_cheek = px(self.LEFT_CHEEK)
-        right_cheek = px(self.RIGHT_CHEEK)
-        forehead = px(self.FOREHEAD)
-        chin = px(self.CHIN)
-
-        # Face geometry
-        face_width = max(1, right_cheek[0] - left_cheek[0])
-        face_height = max(1, chin[1] - forehead[1])
-        face_center_x = (left_cheek[0] + right_cheek[0]) // 2
-        face_center_y = (forehead[1] + chin[1]) // 2
-
-        partial_face = (
-            face_width < self.MIN_FACE_WIDTH or
-            face_height < self.MIN_FACE_HEIGHT
-        )
+        faces = results.multi_face_landmarks
+        return [face_signals(face.landmark, w, h) for face in faces], faces
 
-        # Head Pose
-        """
-        raw pixel distance is unreliable. We normalize using face width.
-        
-        yaw_ratio measures the horizontal displacement of the nose from the face center, 
-        normalized by face width, which estimates how much the head is rotated left or right
-        
-        ≈0  Straight
-        +	Looking right
-        -	Looking left
+    def detect(self, frame, draw=True, canvas=None):
         """
-        yaw_ratio = (nose[0] - face_center_x) / face_width
-        pitch_ratio = (nose[1] - face_center_y) / face_height
+        frame is only read. Debug drawing goes to canvas (an overlay buffer),
+        falling back to frame when no canvas is given.
 
-        looking_away = abs(yaw_ratio) > self.LOOK_AWAY_YAW
-        looking_down = pitch_ratio > self.LOOK_DOWN_PITCH
-        looking_up = pitch_ratio < self.LOOK_UP_PITCH
-
-        # Gaze
-        le_left = px(self.LEFT_EYE_LEFT)
-        le_right = px(self.LEFT_EYE_RIGHT)
-        le_iris = px(self.LEFT_IRIS)
-
-        re_left = px(self.RIGHT_EYE_LEFT)
-        re_right = px(self.RIGHT_EYE_RIGHT)
-        re_iris = px(self.RIGHT_IRIS)
-
-        left_eye_width = max(1, le_right[0] - le_left[0])
-        right_eye_width = max(1, re_right[0] - re_left[0])
-
-        left_gaze = (le_iris[0] - (le_left[0] + le_right[0]) // 2) / left_eye_width
-        right_gaze = (re_iris[0] - (re_left[0] + re_right[0]) // 2) / right_eye_width
-        gaze_ratio = (left_gaze + right_gaze) / 2
-
-        looking_left = gaze_ratio < self.GAZE_LEFT
-        looking_right = gaze_ratio > self.GAZE_RIGHT
-
-        # Blink Detection
-        left_eye = [px(i) for i in self.LEFT_EYE_POINTS]
-        right_eye = [px(i) for i in self.RIGHT_EYE_POINTS]
+        Returns:
+            (looking_away, looking_down, looking_up, looking_left, looking_right, partial_face,
+             yaw, pitch, gaze, ear, blinked, total_blinks, face_count)
+        """
+        signals, faces = self.measure(frame)
+        result = self.rules.evaluate(signals)
 
-        ear = (
-            self._eye_aspect_ratio(left_eye) +
-            self._eye_aspect_ratio(right_eye)
-        ) / 2.0
+        if signals is not None and draw and self.DEBUG:
+            self._draw(frame if canvas is None else canvas, faces, signals, result)
 
-        blinked = False
+        return result
 
-        if ear < self.EAR_THRESHOLD:
-            self.blink_counter += 1
-        else:
-            if self.blink_counter >= self.BLINK_FRAMES:
-                self.total_blinks += 1
-                blinked = True
+    def _draw(self, canvas, faces, signals, result):
+        looking_away = result[0]
+        yaw_ratio, pitch_ratio, gaze_ratio, ear = result[6:10]
+        h, w = canvas.shape[:2]
 
-            self.blink_counter = 0
+        for face, face_signal in zip(faces, signals):
+            landmarks = face.landmark
+            face_points = {i: (int(landmarks[i].x * w), int(landmarks[i].y * h)) for i in DRAWN_LANDMARKS}
+            center_x, center_y = face_signal["center_x"], face_signal["center_y"]
 
-        if draw and self.DEBUG:
             #Nose
-            cv2.circle(frame, nose, 4, (0,255,255), -1)
+            cv2.circle(canvas, face_points[NOSE_TIP], 4, (0,255,255), -1)
 
-            # Left iris
-            cv2.circle(frame, le_iris, 3, (255, 0, 255), -1)
-            # Right iris
-            cv2.circle(frame, re_iris, 3, (255, 0, 255), -1)
+            # Left / Right iris
+            for iris in (face_points[LEFT_IRIS], face_points[RIGHT_IRIS]):
+                cv2.circle(canvas, iris, 3, (255, 0, 255), -1)
 
             # Draw eyes
-            for p in left_eye + right_eye:
-                cv2.circle(frame, p, 2, (255, 0, 255), -1)
+            for i in LEFT_EYE_POINTS + RIGHT_EYE_POINTS:
+                cv2.circle(canvas, face_points[i], 2, (255, 0, 255), -1)
 
             #Face Center line
             cv2.line(
-                frame,
-                (left_cheek[0], face_center_y),
-                (right_cheek[0], face_center_y),
+                canvas,
+                (face_points[LEFT_CHEEK][0], center_y),
+                (face_points[RIGHT_CHEEK][0], center_y),
                 (0,255,0),
-                2 
+                2
             )
 
             #pitch
             cv2.line(
-                frame,
-                (face_center_x, forehead[1]),
-                (face_center_x, chin[1]),
+                canvas,
+                (center_x, face_points[FOREHEAD][1]),
+                (center_x, face_points[CHIN][1]),
                 (255, 255, 0),
                 2
             )
 
-            #Yaw Text
-            cv2.putText(frame, f"Yaw: {yaw_ratio:.2f}",
-                                    (20, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.6,
-                                    (0,255,0) if not looking_away else (0,0,255), 2)
-
-            #pitch text
-            cv2.putText(frame, f"Pitch: {pitch_ratio:.2f}",
-                        (20,110), cv2.FONT_HERSHEY_SIMPLEX, 0.6,
-                        (0,255,0), 2)
-
-            #Gaze text
-            cv2.putText(frame, f"Gaze: {gaze_ratio:.2f}",
-                        (20,140), cv2.FONT_HERSHEY_SIMPLEX, 0.6,
-                        (0,255,0), 2)
-
-            # EAR + Blink info
-            cv2.putText(frame, f"EAR: {ear:.2f} | Blinks: {self.total_blinks}",
-                        (20,170), cv2.FONT_HERSHEY_SIMPLEX, 0.6,
-                        (255,0,255), 2)
-
-
-        return (
-            looking_away,
-            looking_down,
-            looking_up,
-            looking_left,
-            looking_right,
-            partial_face,
-            yaw_ratio,
-            pitch_ratio,
-            gaze_ratio,
-            ear,
-            blinked,
-            self.total_blinks
-        )
\ No newline at end of file
+        # Text is for the primary face (the candidate)
+        #Yaw Text
+        cv2.putText(canvas, f"Yaw: {yaw_ratio:.2f}",
+                                (20, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.6,
+                                (0,255,0) if not looking_away else (0,0,255), 2)
+
+        #pitch text
+        cv2.putText(canvas, f"Pitch: {pitch_ratio:.2f}",
+                    (20,110), cv2.FONT_HERSHEY_SIMPLEX, 0.6,
+                    (0,255,0), 2)
+
+        #Gaze text
+        cv2.putText(canvas, f"Gaze: {gaze_ratio:.2f}",
+                    (20,140), cv2.FONT_HERSHEY_SIMPLEX, 0.6,
+                    (0,255,0), 2)
+
+        # EAR + Blink info
+        cv2.putText(canvas, f"EAR: {ear:.2f} | Blinks: {self.rules.total_blinks} | Faces: {result[12]}",
+                    (20,170), cv2.FONT_HERSHEY_SIMPLEX, 0.6,
+                    (255,0,255), 2)
@@ -1,88 +1,14 @@
-from ultralytics import YOLO
-
-def compute_iou(boxA, boxB):
-    """
-    boxA, boxB: (x1, y1, x2, y2)
-    """
-
-    #This computes the overlapping rectangle between two boxes.
-    # If the boxes overlap, these coordinates define the intersection box
-    xA = max(boxA[0], boxB[0])
-    yA = max(boxA[1], boxB[1])
-    xB = min(boxA[2], boxB[2])
-    yB = min(boxA[3], boxB[3])
-
-    #Calculate area of intersection box
-    inter_w = max(0, xB - xA)
-    inter_h = max(0, yB - yA)
-    inter_area = inter_w * inter_h
-
-    #IoU must be 0 if there is no intersection
-    if inter_area == 0:
-        return 0.0
-
-    #computes individual box areas
-    boxA_area = (boxA[2] - boxA[0]) * (boxA[3] - boxA[1])
-    boxB_area = (boxB[2] - boxB[0]) * (boxB[3] - boxB[1])
-
-    # IoU formula
-    """
-    Area(A∩B) / (Area(A)+Area(B)−Area(A∩B))
-    """
-    return inter_area / float(boxA_area + boxB_area - inter_area)
-
-
-def merge_by_class(detections, classes, iou_threshold=0.5):
-
-    final = []
-    used = set()
-
-    # Group detections by class
-    grouped = {}
-
-    for i, d in enumerate(detections):
-        if d["class"] in classes:
-            grouped.setdefault(d["class"], []).append((i, d))
-        else:
-            final.append(d)
-
-
-    for cls, items in grouped.items():
-
-        clusters = []
-
-        for idx, det in items:
-
-            if idx in used:
-                continue
+import math
 
-            used.add(idx)
-
-            cluster = [det]
-
-            for jdx, other in items:
-
-                if jdx in used:
-                    continue
-
-                if compute_iou(det["bbox"], other["bbox"]) >= iou_threshold:
-                    cluster.append(other)
-                    used.add(jdx)
-
-            clusters.append(cluster)
-
-        # Keep largest from each cluster
-        for cluster in clusters:
-
-            best = max(
-                cluster,
-                key=lambda d: (d["bbox"][2] - d["bbox"][0]) *
-                              (d["bbox"][3] - d["bbox"][1])
-            )
+import numpy as np
+from ultralytics import YOLO
 
-            final.append(best)
+from core.postprocess import PERSON_CLASSES, DetectionFilter, filter_boxes
+from utils.tracer import FrameTracer
 
-    return final
+# ROI crop geometry, relative to the person box
+HEAD_WIDTH_RATIO = 0.5 # head width / person box width (shoulders) for a seated, upper-body candidate
+ROI_MARGIN = 1.3 # widening of the head / hands regions, keeps the ears and objects held beside the body
 
 
 class ObjectDetector:
@@ -95,67 +21,160 @@ class ObjectDetector:
                  book_conf=0.4,
                  phone_conf=0.6,
                  audio_conf=0.5,
+                 raw_conf=None,
+                 roi_pass=False,
+                 roi_size=320,
+                 roi_max_people=2,
+                 tracer=None,
                  ):
 
         self.person_model = YOLO(person_model)
         self.cheat_model = YOLO(cheat_model)
+        self.tracer = tracer or FrameTracer()
+
+        # Confidence floor passed to YOLO itself. None keeps the ultralytics default (0.25),
+        # lower it when recording raw outputs so thresholds below that can be tuned offline
+        self.raw_conf = raw_conf
 
         # Thresholds
-        self.default_conf = default_conf
-        self.person_conf = person_conf
-        self.class_thresholds = {
-            "cell_phone": phone_conf,
-            "book": book_conf,
-            "headphone": audio_conf,
-            "earbud": audio_conf,
+        self.filter = DetectionFilter(default_conf, person_conf, book_conf, phone_conf, audio_conf)
+        self.names = {
+            "person": self.person_model.names,
+            "cheat": self.cheat_model.names,
         }
 
-    def _run_model(self, model, frame, allowed_classes, default_conf):
-        detections = []
-
-        results = model(frame, verbose=False)
-
-        for r in results:
-            for box in r.boxes:
-                cls_id = int(box.cls[0])
-                name = model.names[cls_id]
-                conf = float(box.conf[0])
-
-                if name not in allowed_classes:
-                    continue
-
-                threshold = self.class_thresholds.get(name, default_conf)
+        # Two-stage mode: cheat_model again on squares around the head / hands of the detected people,
+        # at native resolution, so earbuds and phones held low are not shrunk to a few pixels.
+        # roi_size is the smallest square, they grow with a close candidate's head. Each crop costs a
+        # (side / full_imgsz)^2 fraction of a full-frame pass
+        self.roi_pass = roi_pass
+        self.roi_size = 32 * math.ceil(roi_size / 32)
+        self.roi_max_people = roi_max_people
+        if roi_pass:
+            self.names["roi"] = self.cheat_model.names
+
+        # Input size of the full-frame pass (the training imgsz ultralytics keeps in the checkpoint)
+        imgsz = self.cheat_model.overrides.get("imgsz", 640)
+        self.full_imgsz = max(imgsz) if isinstance(imgsz, (list, tuple)) else imgsz
+
+    def _run_model(self, model, frame):
+        """
+        Runs one model and returns its unfiltered output as numpy arrays:
+        (boxes (N, 4) xyxy, confidences (N,), class ids (N,))
+        """
+        with self.tracer.span("_run_model", model=str(getattr(model, "ckpt_path", ""))):
+            kwargs = {} if self.raw_conf is None else {"conf": self.raw_conf}
+            results = model(frame, verbose=False, **kwargs)
+
+            boxes = results[0].boxes
+            return (
+                boxes.xyxy.cpu().numpy(),
+                boxes.conf.cpu().numpy(),
+                boxes.cls.cpu().numpy().astype(int)
+            )
 
-                if conf < threshold:
-                    continue
+    def _roi_boxes(self, person_raw, frame_shape):
+        """
+        Squares around the head and hands of the largest people, (x1, y1, x2, y2).
+        All squares of a frame have the same side, so they run in one batch at native resolution.
+
+        Side = roi_size, or the head square of the widest person when larger: HEAD_WIDTH_RATIO of
+        the person box width, widened by ROI_MARGIN for the ears. Capped at full_imgsz, so a crop
+        never costs more than a full-frame pass. The hands row gets as many squares as the person
+        box, widened by ROI_MARGIN, needs. Squares are shifted, not clipped, to stay inside the frame.
+
+        Empty when the full-frame pass already runs at native scale or above (frame no bigger than
+        full_imgsz, e.g. a 640x480 webcam): a native crop would not show more detail than it.
+        """
+        h, w = frame_shape[:2]
+        if self.full_imgsz / max(h, w) >= 1.0 or min(h, w) < self.roi_size:
+            return []
+
+        people = filter_boxes(*person_raw, self.names["person"], PERSON_CLASSES, {}, self.filter.person_conf)
+        people = sorted(
+            people,
+            key=lambda d: (d["bbox"][2] - d["bbox"][0]) * (d["bbox"][3] - d["bbox"][1]),
+            reverse=True
+        )[:self.roi_max_people]
+        if not people:
+            return []
+
+        widest = max(d["bbox"][2] - d["bbox"][0] for d in people)
+        size = 32 * math.ceil(max(self.roi_size, HEAD_WIDTH_RATIO * ROI_MARGIN * widest) / 32)
+        size = min(size, max(self.full_imgsz, self.roi_size), 32 * (min(h, w) // 32))
+
+        def square(cx, cy):
+            rx1 = int(min(max(cx - size / 2, 0), w - size))
+            ry1 = int(min(max(cy - size / 2, 0), h - size))
+            return rx1, ry1, rx1 + size, ry1 + size
+
+        rois = []
+        for d in people:
+            x1, y1, x2, y2 = d["bbox"]
+            bh = y2 - y1
+            cx = (x1 + x2) / 2
+
+            if bh > size:
+                # Head = top of the person box, hands = lower part
+                rois.append(square(cx, y1 + size / 2))
+                row_y = y1 + 0.75 * bh
+            else:
+                # One row covers the whole of a small person
+                row_y = (y1 + y2) / 2
+
+            # Hands row: person box widened by ROI_MARGIN, evenly overlapping squares across it
+            half = ROI_MARGIN * (x2 - x1) / 2
+            left, right = max(cx - half, 0), min(cx + half, w)
+            tiles = max(1, math.ceil((right - left) / size))
+            step = (right - left - size) / (tiles - 1) if tiles > 1 else 0
+            start = left + size / 2 if tiles > 1 else (left + right) / 2
+            rois.extend(square(start + i * step, row_y) for i in range(tiles))
+
+        return rois
+
+    def _run_roi(self, frame, person_raw):
+        """
+        cheat_model on all head / hands crops in one batch at native resolution, boxes mapped back
+        to frame coordinates. Same (boxes, confidences, class ids) layout as _run_model.
+        """
+        rois = self._roi_boxes(person_raw, frame.shape)
+        if not rois:
+            return np.empty((0, 4), dtype=np.float32), np.empty(0, dtype=np.float32), np.empty(0, dtype=int)
+
+        # Crops are views into the frame, no copy. All are squares of one side and imgsz = that side,
+        # so they are neither letterboxed nor rescaled
+        crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in rois]
+        size = rois[0][2] - rois[0][0]
+
+        with self.tracer.span("roi_pass", crops=len(crops), imgsz=size):
+            kwargs = {} if self.raw_conf is None else {"conf": self.raw_conf}
+            results = self.cheat_model(crops, verbose=False, imgsz=size, **kwargs)
+
+            boxes, confs, class_ids = [], [], []
+            for (x1, y1, _, _), r in zip(rois, results):
+                boxes.append(r.boxes.xyxy.cpu().numpy() + (x1, y1, x1, y1))
+                confs.append(r.boxes.conf.cpu().numpy())
+                class_ids.append(r.boxes.cls.cpu().numpy().astype(int))
+
+            return np.concatenate(boxes), np.concatenate(confs), np.concatenate(class_ids)
+
+    def detect_raw(self, frame):
+        """
+        Unfiltered output of both models, keyed "person" / "cheat",
+        plus "roi" (cheat_model on head / hands crops) when roi_pass is on
+        """
+        raw = {
+            "person": self._run_model(self.person_model, frame),
+            "cheat": self._run_model(self.cheat_model, frame),
+        }
 
-                x1, y1, x2, y2 = map(int, box.xyxy[0])
+        if self.roi_pass:
+            raw["roi"] = self._run_roi(frame, raw["person"])
 
-                detections.append({
-                    "class": name,
-                    "confidence": conf,
-                    "bbox": (x1, y1, x2, y2)
-                })
+        return raw
 
-        return detections
+    def filter_raw(self, raw):
+        return self.filter.apply(raw, self.names)
 
     def detect(self, frame):
-
-        # 1️⃣ Person detection
-        person_dets = self._run_model(
-            self.person_model,
-            frame,
-            {"person"},
-            self.person_conf
-        )
-
-        # 2️⃣ Cheating objects
-        cheat_dets = self._run_model(
-            self.cheat_model,
-            frame,
-            {"person", "cell_phone", "book", "headphone", "earbud"},
-            self.default_conf
-        )
-
-        # Merge
-        return person_dets + cheat_dets
\ No newline at end of file
+        return self.filter_raw(self.detect_raw(frame))
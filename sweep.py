@@ -0,0 +1,192 @@
+"""
+Replays cached detections (build_cache.py) through the post-processing, tracking
+and alert logic for every combination of thresholds in a grid. No models are run.
+
+    python sweep.py cache/*.npz \
+        --grid phone_conf=0.4,0.5,0.6 \
+        --grid OBJECT_MIN_VOTES=3,5,7 \
+        --grid look_away_yaw=0.15,0.2,0.25 \
+        --out sweep.csv
+
+Parameters:
+    DetectionFilter:  default_conf, person_conf, book_conf, phone_conf, audio_conf
+    HeadPoseRules:    look_away_yaw, look_down_pitch, look_up_pitch, gaze_left, gaze_right,
+                      ear_threshold, blink_frames, min_face_width, min_face_height
+    config:           LOOKING_AWAY_THRESHOLD, OBJECT_WINDOW, OBJECT_MIN_VOTES,
+                      COOLDOWN_SECONDS, RESET_COOLDOWN_SECONDS
+
+Caches recorded with --roi-pass hold cheat_model outputs on crops around the people found
+at build time (ObjectDetector person_conf). Sweeping person_conf filters the person boxes
+but does not move those crops, rebuild the cache to test another ROI placement.
+"""
+import argparse
+import csv
+import inspect
+import itertools
+import math
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import config
+from core import HeadPoseRules, ProctorSession
+from core.postprocess import DetectionFilter
+from core.session import default_states
+from utils import DetectionCache
+
+
+def _defaults(cls):
+    return {
+        name: p.default
+        for name, p in inspect.signature(cls).parameters.items()
+        if p.default is not inspect.Parameter.empty
+    }
+
+
+FILTER_PARAMS = _defaults(DetectionFilter)
+RULE_PARAMS = _defaults(HeadPoseRules)
+SESSION_PARAMS = {
+    name: getattr(config, name)
+    for name in ("LOOKING_AWAY_THRESHOLD", "OBJECT_WINDOW", "OBJECT_MIN_VOTES",
+                 "COOLDOWN_SECONDS", "RESET_COOLDOWN_SECONDS")
+}
+ALL_PARAMS = {**FILTER_PARAMS, **RULE_PARAMS, **SESSION_PARAMS}
+INT_PARAMS = {"blink_frames", "OBJECT_WINDOW", "OBJECT_MIN_VOTES"}
+
+ALERT_KEYS = list(default_states())
+
+
+class ReplayClock:
+    """
+    Stands in for time.time so the trackers run on video time
+    """
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def replay(frames, names, params):
+    """
+    Runs one cached session with one parameter set, returns alert counts per key
+    """
+    clock = ReplayClock()
+    detection_filter = DetectionFilter(**{k: params[k] for k in FILTER_PARAMS})
+    rules = HeadPoseRules(**{k: params[k] for k in RULE_PARAMS})
+    session = ProctorSession(
+        params["COOLDOWN_SECONDS"],
+        params["RESET_COOLDOWN_SECONDS"],
+        params["LOOKING_AWAY_THRESHOLD"],
+        params["OBJECT_WINDOW"],
+        params["OBJECT_MIN_VOTES"],
+        (config.FAKE_WINDOW, config.SAMPLE_INTERVAL, config.MIN_VARIANCE,
+         config.NO_BLINK_TIMEOUT, config.LIVENESS_WEIGHTS),
+        clock=clock
+    )
+
+    counts = Counter()
+    for t, raw, signals in frames:
+        clock.now = t
+        _, fired = session.step(detection_filter.apply(raw, names), rules.evaluate(signals))
+        counts.update(fired)
+
+    return counts
+
+
+@lru_cache(maxsize=2)
+def load_cache(path):
+    """
+    Decoded frames of one cache, kept per worker process: chunks of the same
+    session are submitted back to back, so a worker usually decodes it once
+    """
+    cache = DetectionCache(path)
+    return cache, list(cache.frames())
+
+
+def run_chunk(path, combos):
+    """
+    Worker task: one cached session, one chunk of the combinations
+    """
+    cache, frames = load_cache(path)
+    session_name = cache.meta.get("video", os.path.basename(path))
+
+    rows = []
+    for params in combos:
+        counts = replay(frames, cache.names, params)
+        rows.append({
+            **params,
+            "session": session_name,
+            "frames": len(cache),
+            "alerts_total": sum(counts.values()),
+            **{key: counts[key] for key in ALERT_KEYS},
+        })
+    return rows
+
+
+def make_tasks(caches, combos, workers):
+    """
+    (cache, combination chunk) tasks, about 4 per worker, so a large grid over
+    few sessions is spread over every core instead of one core per session
+    """
+    chunks_per_cache = max(1, min(len(combos), math.ceil(4 * workers / len(caches))))
+    size = math.ceil(len(combos) / chunks_per_cache)
+    return [
+        (path, combos[start:start + size])
+        for path in caches
+        for start in range(0, len(combos), size)
+    ]
+
+
+def parse_grid(specs):
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if name not in ALL_PARAMS:
+            raise SystemExit(f"Unknown parameter {name!r}, expected one of: {', '.join(ALL_PARAMS)}")
+
+        cast = int if name in INT_PARAMS else float
+        grid[name] = [cast(v) for v in values.split(",")]
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("caches", nargs="+")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2,...")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="sweep.csv")
+    args = parser.parse_args()
+
+    grid = parse_grid(args.grid)
+    combos = [
+        {**ALL_PARAMS, **dict(zip(grid, values))}
+        for values in itertools.product(*grid.values())
+    ]
+
+    tasks = make_tasks(args.caches, combos, args.workers)
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        results = executor.map(run_chunk, *zip(*tasks))
+        rows = [row for rows in results for row in rows]
+
+    fields = list(ALL_PARAMS) + ["session", "frames", "alerts_total"] + ALERT_KEYS
+    with open(args.out, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    # Summary: total alerts per combination across all sessions
+    totals = Counter()
+    for row in rows:
+        totals[tuple(row[name] for name in grid)] += row["alerts_total"]
+
+    for values, total in sorted(totals.items()):
+        label = ", ".join(f"{name}={v}" for name, v in zip(grid, values)) or "defaults"
+        print(f"{label}: {total} alerts")
+
+    print(f"{len(combos)} combinations x {len(args.caches)} sessions -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
 from .alerts import AlertManager
-from .draw import draw_alerts, draw_detections
+from .buffer_pool import FrameBufferPool
+from .detection_cache import DetectionCache, DetectionCacheWriter
+from .draw import apply_overlay, draw_alerts, draw_detections
+from .tracer import FrameTracer
 
-__all__ = ["AlertManager", "draw_alerts", "draw_detections"]
\ No newline at end of file
+__all__ = ["AlertManager", "FrameBufferPool", "DetectionCache", "DetectionCacheWriter", "apply_overlay", "draw_alerts", "draw_detections", "FrameTracer"]
\ No newline at end of file
@@ -2,9 +2,10 @@ from collections import deque
 import time
 
 class AlertManager: 
-    def __init__(self, display_duration=2.0):
+    def __init__(self, display_duration=2.0, clock=time.time):
         self.alerts = deque()
         self.display_duration = display_duration
+        self.clock = clock
 
     def add_alert(self, message):
         """
@@ -12,14 +13,14 @@ class AlertManager:
         """
         self.alerts.append({
             "message": message,
-            "timestamp": time.time()
+            "timestamp": self.clock()
         })
     
     def get_active_alerts(self):
         """
         returns alerts whose display_duration is not completed and removes the expired ones          
         """
-        current_time = time.time()
+        current_time = self.clock()
 
         while self.alerts and current_time - self.alerts[0]["timestamp"] > self.display_duration:
             self.alerts.popleft()
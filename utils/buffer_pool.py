@@ -0,0 +1,35 @@
+import numpy as np
+
+
+class FrameBufferPool:
+    """
+    Preallocated image buffers reused across frames.
+
+    OpenCV writes into an existing array when it is passed as `dst`
+    (or `image` for VideoCapture.read) and the shape / dtype match,
+    so the per-frame path does not allocate new frames.
+    """
+
+    def __init__(self):
+        self.buffers = {}
+        self.allocations = 0
+
+    def get(self, name, shape, dtype=np.uint8):
+        """
+        Returns the buffer registered under `name`, (re)allocating it only
+        when the requested shape or dtype changed
+        """
+        buf = self.buffers.get(name)
+
+        if buf is None or buf.shape != tuple(shape) or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self.buffers[name] = buf
+            self.allocations += 1
+
+        return buf
+
+    def like(self, name, src):
+        return self.get(name, src.shape, src.dtype)
+
+    def nbytes(self):
+        return sum(b.nbytes for b in self.buffers.values())
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# Bump when the stored layout or the meaning of a stored signal changes
+CACHE_VERSION = 4
+
+MODELS = ("person", "cheat", "roi") # "roi" only when recorded with the ROI pass
+HEAD_SIGNALS = ("yaw", "pitch", "gaze", "ear", "face_width", "face_height", "center_x", "center_y")
+
+
+def file_fingerprint(path, head_bytes=1 << 20):
+    """
+    Cheap content key: file size + sha1 of the first MB.
+    Falls back to the name for weights ultralytics resolves itself.
+    """
+    if not os.path.isfile(path):
+        return hashlib.sha1(str(path).encode()).hexdigest()[:12]
+
+    digest = hashlib.sha1(str(os.path.getsize(path)).encode())
+    with open(path, "rb") as f:
+        digest.update(f.read(head_bytes))
+    return digest.hexdigest()[:12]
+
+
+def model_version(*parts):
+    """
+    Key for everything that changes the stored outputs: weights, raw_conf, library versions
+    """
+    digest = hashlib.sha1(f"v{CACHE_VERSION}".encode())
+    for part in parts:
+        digest.update(str(part).encode())
+    return digest.hexdigest()[:10]
+
+
+def cache_path(cache_dir, video_path, version):
+    stem = os.path.splitext(os.path.basename(video_path))[0]
+    return os.path.join(cache_dir, f"{stem}-{file_fingerprint(video_path)}-{version}.npz")
+
+
+class DetectionCacheWriter:
+    """
+    Collects unfiltered model outputs + per-face head signals frame by frame.
+    Boxes and faces of all frames are stored in flat arrays with per-frame offsets.
+    """
+
+    def __init__(self, names):
+        self.names = names
+        self.timestamps = []
+        self.head = []
+        self.face_counts = []
+        self.models = [m for m in MODELS if m in names]
+        self.boxes = {m: [] for m in self.models}
+        self.counts = {m: [] for m in self.models}
+
+    def add(self, timestamp, raw, signals):
+        self.timestamps.append(timestamp)
+
+        if signals is None:
+            self.face_counts.append(0)
+        else:
+            self.head.extend([face[k] for k in HEAD_SIGNALS] for face in signals)
+            self.face_counts.append(len(signals))
+
+        for m in self.models:
+            self.boxes[m].append(raw[m])
+            self.counts[m].append(len(raw[m][1]))
+
+    def save(self, path, meta=None):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        arrays = {
+            "timestamps": np.asarray(self.timestamps, dtype=np.float64),
+            # float64, as measured live: yaw / gaze are pixel ratios that often land exactly on a
+            # threshold (30 / 150 = 0.2), float32(0.2) > 0.2 would fire alerts the live path does not
+            "head": np.array(self.head, dtype=np.float64).reshape(-1, len(HEAD_SIGNALS)),
+            "head_offsets": np.concatenate(([0], np.cumsum(self.face_counts))).astype(np.int64),
+            "meta": np.array(json.dumps({
+                "version": CACHE_VERSION,
+                "models": self.models,
+                "names": {m: {int(k): v for k, v in self.names[m].items()} for m in self.models},
+                **(meta or {}),
+            })),
+        }
+
+        for m in self.models:
+            frames = self.boxes[m]
+            arrays[f"{m}_offsets"] = np.concatenate(([0], np.cumsum(self.counts[m]))).astype(np.int64)
+            arrays[f"{m}_boxes"] = np.concatenate([f[0] for f in frames] or [np.empty((0, 4))]).astype(np.float32).reshape(-1, 4)
+            arrays[f"{m}_conf"] = np.concatenate([f[1] for f in frames] or [np.empty(0)]).astype(np.float32)
+            arrays[f"{m}_cls"] = np.concatenate([f[2] for f in frames] or [np.empty(0)]).astype(np.int16)
+
+        np.savez_compressed(path, **arrays)
+        return path
+
+
+class DetectionCache:
+    """
+    Read side of DetectionCacheWriter. frames() yields the same (raw, signals)
+    the live detectors produce, so post-processing runs unchanged on it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+        with np.load(path) as data:
+            self.arrays = {k: data[k] for k in data.files}
+
+        self.meta = json.loads(str(self.arrays["meta"]))
+        if self.meta["version"] != CACHE_VERSION:
+            raise ValueError(f"{path}: cache version {self.meta['version']}, expected {CACHE_VERSION}")
+
+        self.models = self.meta["models"]
+        self.names = {m: {int(k): v for k, v in self.meta["names"][m].items()} for m in self.models}
+
+    def __len__(self):
+        return len(self.arrays["timestamps"])
+
+    def frames(self):
+        """
+        Yields (timestamp, raw, signals) per frame. raw matches ObjectDetector.detect_raw,
+        signals matches HeadPoseDetector.measure (None when no face was found).
+        """
+        a = self.arrays
+        head = a["head"].tolist()
+        head_offsets = a["head_offsets"]
+
+        for i, t in enumerate(a["timestamps"]):
+            raw = {}
+            for m in self.models:
+                start, end = a[f"{m}_offsets"][i], a[f"{m}_offsets"][i + 1]
+                raw[m] = (a[f"{m}_boxes"][start:end], a[f"{m}_conf"][start:end], a[f"{m}_cls"][start:end])
+
+            faces = head[head_offsets[i]:head_offsets[i + 1]]
+            signals = [dict(zip(HEAD_SIGNALS, face)) for face in faces] or None
+
+            yield float(t), raw, signals
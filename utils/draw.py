@@ -11,7 +11,7 @@ def draw_alerts(frame, alerts):
                     fontScale=0.6, #Controls text size : Relative value (not pixels)
                     color=(0,0,255), 
                     thickness=1, 
-                    lineType=cv2.LINE_AA
+                    lineType=cv2.LINE_8 #no anti-aliasing: drawn on the black overlay, AA edges would be pasted as dark pixels
                 )
         y_offset += 30
 
@@ -32,3 +32,16 @@ def draw_detections(frame, detections):
                     fontScale=0.6, 
                     color=(0, 255, 0), 
                     thickness=1)
+
+
+def apply_overlay(frame, overlay, mask):
+    """
+    Copies the annotated pixels of overlay onto frame: every non-zero overlay
+    pixel is pasted as is, without blending. Annotations must therefore be drawn
+    on the black overlay with non-black colors and without anti-aliasing
+    (cv2.LINE_8, the default). Anti-aliased edges are darkened towards black on
+    the overlay and would show up on frame as dark halos.
+    mask is a preallocated single channel buffer of frame's height / width.
+    """
+    cv2.cvtColor(overlay, cv2.COLOR_BGR2GRAY, dst=mask)
+    cv2.copyTo(overlay, mask, frame)
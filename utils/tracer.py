@@ -0,0 +1,120 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+
+class FrameTracer:
+    """
+    Opt-in span recorder that dumps Chrome / Perfetto trace JSON
+    (open the file in chrome://tracing or ui.perfetto.dev).
+
+    Spans live in a fixed-size ring buffer, so tracing can stay on for a
+    whole session and only the most recent frames are kept.
+    """
+
+    def __init__(self, enabled=False, buffer_size=20000, slow_frame_ms=None, output_dir="traces",
+                 slow_dump_cooldown=30.0):
+        self.enabled = enabled
+        self.events = deque(maxlen=buffer_size)
+        self.slow_frame_ms = slow_frame_ms
+        self.output_dir = output_dir
+
+        # At most one automatic dump per slow_dump_cooldown seconds: when every frame is slow,
+        # writing a file per frame would fill output_dir and add stalls of its own
+        self.slow_dump_cooldown = slow_dump_cooldown
+        self.last_slow_dump = None
+
+        self.pid = os.getpid()
+        self.frame_index = 0
+        self.frame_start = None
+        self.last_frame_ms = 0.0
+
+    @staticmethod
+    def _now_us():
+        return time.perf_counter_ns() / 1000.0
+
+    def _record(self, name, start_us, end_us, args=None):
+        event = {
+            "name": name,
+            "cat": "frame" if name == "frame" else "stage",
+            "ph": "X", # complete event: begin timestamp + duration
+            "ts": start_us,
+            "dur": end_us - start_us,
+            "pid": self.pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+
+        # deque.append is atomic, safe to call from worker threads
+        self.events.append(event)
+
+    @contextmanager
+    def _span(self, name, args):
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            self._record(name, start, self._now_us(), args)
+
+    def span(self, name, **args):
+        """
+        Context manager timing one stage of the frame
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._span(name, args)
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.frame_start = self._now_us()
+
+    def end_frame(self):
+        """
+        Closes the current frame span. Returns path of the dump if the
+        frame exceeded slow_frame_ms and no automatic dump was written in the
+        last slow_dump_cooldown seconds, else None.
+        """
+        if not self.enabled or self.frame_start is None:
+            return None
+
+        end = self._now_us()
+        self._record("frame", self.frame_start, end, {"index": self.frame_index})
+
+        self.last_frame_ms = (end - self.frame_start) / 1000.0
+        self.frame_start = None
+        self.frame_index += 1
+
+        if self.slow_frame_ms is None or self.last_frame_ms <= self.slow_frame_ms:
+            return None
+
+        now = time.monotonic()
+        if self.last_slow_dump is not None and now - self.last_slow_dump < self.slow_dump_cooldown:
+            return None
+
+        self.last_slow_dump = now
+        return self.dump(reason=f"slow_frame_{self.frame_index - 1}")
+
+    def dump(self, path=None, reason="manual"):
+        """
+        Writes the ring buffer as Chrome trace JSON and returns the file path
+        """
+        if path is None:
+            os.makedirs(self.output_dir, exist_ok=True)
+            # ms resolution, two dumps within the same second must not overwrite each other
+            now = time.time()
+            stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(now)) + f"_{int(now * 1000) % 1000:03d}"
+            path = os.path.join(self.output_dir, f"trace_{stamp}_{reason}.json")
+
+        trace = {
+            "traceEvents": list(self.events),
+            "displayTimeUnit": "ms",
+        }
+        with open(path, "w") as f:
+            json.dump(trace, f)
+
+        return path